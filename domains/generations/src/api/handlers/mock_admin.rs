@@ -2,8 +2,9 @@
 
 use axum::{extract::State, http::StatusCode, Json};
 use framecast_common::{Error, Result, ValidatedJson};
-use framecast_runpod::mock::MockOutcome;
+use framecast_runpod::mock::{MockOutcome, MockRenderBehavior};
 use serde::{Deserialize, Serialize};
+use std::sync::Arc;
 use validator::Validate;
 
 use crate::api::middleware::GenerationsState;
@@ -27,29 +28,30 @@ pub struct MockHistoryEntry {
     pub callback_url: String,
 }
 
-/// Configure mock render behavior
-pub async fn configure_mock(
-    State(state): State<GenerationsState>,
-    ValidatedJson(req): ValidatedJson<ConfigureMockRequest>,
-) -> Result<StatusCode> {
-    let behavior = state
-        .mock_render_behavior
-        .as_ref()
-        .ok_or_else(|| Error::NotFound("Mock render service not enabled".to_string()))?;
+/// Parse a requested outcome name
+fn parse_outcome(outcome: &str) -> Result<MockOutcome> {
+    match outcome {
+        "complete" => Ok(MockOutcome::Complete),
+        "fail" => Ok(MockOutcome::Fail),
+        "timeout" => Ok(MockOutcome::Timeout),
+        other => Err(Error::Validation(format!(
+            "Unknown outcome: '{}'. Valid values: complete, fail, timeout",
+            other
+        ))),
+    }
+}
 
-    if let Some(outcome) = req.outcome {
-        let mock_outcome = match outcome.as_str() {
-            "complete" => MockOutcome::Complete,
-            "fail" => MockOutcome::Fail,
-            "timeout" => MockOutcome::Timeout,
-            other => {
-                return Err(Error::Validation(format!(
-                    "Unknown outcome: '{}'. Valid values: complete, fail, timeout",
-                    other
-                )));
-            }
-        };
-        behavior.set_outcome(mock_outcome);
+/// Apply the fields set in a configure request to the mock behavior
+///
+/// `outcome` is the request's outcome, already parsed so callers can reject
+/// an invalid request before touching any state.
+fn apply_config(
+    behavior: &MockRenderBehavior,
+    outcome: Option<MockOutcome>,
+    req: ConfigureMockRequest,
+) {
+    if let Some(outcome) = outcome {
+        behavior.set_outcome(outcome);
     }
 
     if let Some(delay) = req.delay_ms {
@@ -67,6 +69,20 @@ pub async fn configure_mock(
     if let Some(output) = req.output_payload {
         behavior.set_output_payload(output);
     }
+}
+
+/// Configure mock render behavior
+pub async fn configure_mock(
+    State(state): State<GenerationsState>,
+    ValidatedJson(req): ValidatedJson<ConfigureMockRequest>,
+) -> Result<StatusCode> {
+    let behavior = state
+        .mock_render_behavior
+        .as_ref()
+        .ok_or_else(|| Error::NotFound("Mock render service not enabled".to_string()))?;
+    let outcome = req.outcome.as_deref().map(parse_outcome).transpose()?;
+
+    apply_config(behavior, outcome, req);
 
     Ok(StatusCode::OK)
 }
@@ -97,6 +113,29 @@ pub async fn get_history(
 
 /// Reset mock render behavior and history
 pub async fn reset_mock(State(state): State<GenerationsState>) -> Result<StatusCode> {
+    reset_state(&state)?;
+
+    Ok(StatusCode::OK)
+}
+
+/// Reset mock render behavior and history, then apply a configuration
+///
+/// Equivalent to `reset` followed by `configure`, in one request. An invalid
+/// request is rejected before anything is reset.
+pub async fn reset_and_configure_mock(
+    State(state): State<GenerationsState>,
+    ValidatedJson(req): ValidatedJson<ConfigureMockRequest>,
+) -> Result<StatusCode> {
+    let outcome = req.outcome.as_deref().map(parse_outcome).transpose()?;
+    let behavior = reset_state(&state)?;
+
+    apply_config(behavior, outcome, req);
+
+    Ok(StatusCode::OK)
+}
+
+/// Reset behavior and clear history, returning the behavior for reconfiguration
+fn reset_state(state: &GenerationsState) -> Result<&Arc<MockRenderBehavior>> {
     let behavior = state
         .mock_render_behavior
         .as_ref()
@@ -112,5 +151,5 @@ pub async fn reset_mock(State(state): State<GenerationsState>) -> Result<StatusC
         .map_err(|e| Error::Internal(format!("Failed to lock mock history: {}", e)))?
         .clear();
 
-    Ok(StatusCode::OK)
+    Ok(behavior)
 }
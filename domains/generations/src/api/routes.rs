@@ -49,6 +49,10 @@ pub fn routes() -> Router<GenerationsState> {
                 get(mock_admin::get_history),
             )
             .route("/internal/mock/render/reset", post(mock_admin::reset_mock))
+            .route(
+                "/internal/mock/render/reset_and_configure",
+                post(mock_admin::reset_and_configure_mock),
+            )
     };
 
     router
@@ -0,0 +1,3 @@
+-- Revert: Remove created_at index from generation_events
+
+DROP INDEX IF EXISTS idx_generation_events_created_at;
@@ -0,0 +1,8 @@
+-- Add created_at index for generation event retention.
+--
+-- cleanup_old_generation_events() deletes by created_at alone, but the
+-- existing indexes lead with generation_id, so the retention DELETE
+-- falls back to a sequential scan of generation_events. A plain btree on
+-- created_at turns it into a bounded index range scan.
+
+CREATE INDEX idx_generation_events_created_at ON generation_events (created_at);
@@ -0,0 +1,24 @@
+"""Shared file-scanning dispatch for the validation scripts.
+
+Pre-commit can pass hundreds of files to a hook. Scanning is CPU-bound, so
+large batches fan out across processes once they outweigh the pool startup
+cost.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+
+def scan_files(scan_file, file_paths):
+    """Run scan_file over file_paths and return all errors, in file order."""
+    if len(file_paths) < PARALLEL_MIN_FILES:
+        return [error for path in file_paths for error in scan_file(path)]
+
+    errors = []
+    with ProcessPoolExecutor() as executor:
+        for file_errors in executor.map(scan_file, file_paths, chunksize=8):
+            errors.extend(file_errors)
+
+    return errors
@@ -4,56 +4,77 @@
 Ensures API specification files are consistent and well-formed.
 """
 
+import functools
 import os
 import re
 import sys
 
+from parallel_scan import scan_files
 
-def validate_api_spec(file_paths):
-    """Validate API specification consistency."""
+# Markdown link: [text](url)
+LINK_PATTERN = re.compile(rb"\[([^\]]+)\]\(([^)]+)\)")
+
+# Heading with a space after the leading #'s
+HEADING_PATTERN = re.compile(rb"^#+\s+\S")
+
+
+@functools.lru_cache(maxsize=4096)
+def link_target_exists(target_path):
+    """Return whether a link target exists, caching the stat per path."""
+    return os.path.exists(target_path)
+
+
+def scan_file(file_path):
+    """Scan one specification file for consistency issues."""
     errors = []
 
-    for file_path in file_paths:
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
+    # Links resolve relative to the file, so compute its directory once
+    spec_dir = os.path.dirname(file_path)
 
+    try:
+        # Checks are ASCII-only; scan raw bytes and only decode links
+        with open(file_path, "rb") as f:
             # Check for common specification issues
-            lines = content.split("\n")
-
-            for line_num, line in enumerate(lines, 1):
+            # bytes.splitlines() keeps universal-newline line numbering
+            for line_num, line in enumerate(f.read().splitlines(), 1):
                 # Check for placeholder text that should be replaced
-                if "TODO" in line or "FIXME" in line:
+                if b"TODO" in line or b"FIXME" in line:
                     errors.append(f"{file_path}:{line_num}: Contains TODO/FIXME")
 
                 # Check for broken internal links
-                link_pattern = r"\[([^\]]+)\]\(([^)]+)\)"
-                for match in re.finditer(link_pattern, line):
-                    link_url = match.group(2)
-
-                    # Check internal markdown links
-                    if link_url.endswith(".md") and not link_url.startswith("http"):
-                        # Resolve relative path
-                        spec_dir = os.path.dirname(file_path)
-                        target_path = os.path.join(spec_dir, link_url)
-
-                        if not os.path.exists(target_path):
-                            errors.append(
-                                f"{file_path}:{line_num}: Broken link to {link_url}"
+                if b"](" in line:
+                    for match in LINK_PATTERN.finditer(line):
+                        link_url = os.fsdecode(match.group(2))
+
+                        # Check internal markdown links
+                        if link_url.endswith(".md") and not link_url.startswith("http"):
+                            # Resolve relative path
+                            target_path = os.path.normpath(
+                                os.path.join(spec_dir, link_url)
                             )
 
+                            if not link_target_exists(target_path):
+                                errors.append(
+                                    f"{file_path}:{line_num}: Broken link to {link_url}"
+                                )
+
                 # Check for consistent heading format
-                if line.startswith("#") and not re.match(r"^#+\s+\S", line):
+                if line.startswith(b"#") and not HEADING_PATTERN.match(line):
                     errors.append(
                         f"{file_path}:{line_num}: Heading should have space after #"
                     )
 
-        except Exception as e:
-            errors.append(f"Error reading {file_path}: {e}")
+    except Exception as e:
+        errors.append(f"Error reading {file_path}: {e}")
 
     return errors
 
 
+def validate_api_spec(file_paths):
+    """Validate API specification consistency."""
+    return scan_files(scan_file, file_paths)
+
+
 def main():
     """Run API specification validation as main entry point."""
     if len(sys.argv) < 2:
@@ -7,77 +7,107 @@ Ensures no hardcoded values and proper environment variable patterns.
 import re
 import sys
 
-
-def validate_env_vars(file_paths):
-    """Validate environment variable usage."""
-    errors = []
-
-    # Patterns to detect potential hardcoded values
-    suspicious_patterns = [
-        (r'postgresql://[^"]*:[^"]*@[^"]*', "Hardcoded database URL"),
-        (r"https://[a-zA-Z0-9-]+\.supabase\.co", "Hardcoded Supabase URL"),
-        (r"sk_[a-zA-Z0-9]{32,}", "Hardcoded API key"),
-        (r"AKIA[0-9A-Z]{16}", "Hardcoded AWS access key"),
+from parallel_scan import scan_files
+
+# Patterns to detect potential hardcoded values
+SUSPICIOUS_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), description)
+    for pattern, description in [
+        (rb'postgresql://[^"]*:[^"]*@[^"]*', "Hardcoded database URL"),
+        (rb"https://[a-zA-Z0-9-]+\.supabase\.co", "Hardcoded Supabase URL"),
+        (rb"sk_[a-zA-Z0-9]{32,}", "Hardcoded API key"),
+        (rb"AKIA[0-9A-Z]{16}", "Hardcoded AWS access key"),
         (
-            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+            rb"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
             "Hardcoded UUID (potential secret)",
         ),
     ]
-
-    # Allowed hardcoded patterns (examples, test data, etc.)
-    allowed_patterns = [
-        r"test@.*\.dev",  # Test emails
-        r"example\.com",  # Example domains
-        r"localhost",  # Local development
-        r"127\.0\.0\.1",  # Local IP
-        r"framecast:.*:.*",  # URN patterns
-        r"usr_[a-zA-Z0-9]+",  # Test user IDs
-        r"tm_[a-zA-Z0-9]+",  # Test team IDs
-        r"00000000-0000-0000-0000-000000000001",  # Test UUID pattern
-        r"test_.*",  # Test identifiers
-        r"fake_.*",  # Fake identifiers
+]
+
+# Allowed hardcoded patterns (examples, test data, etc.)
+ALLOWED_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        rb"test@.*\.dev",  # Test emails
+        rb"example\.com",  # Example domains
+        rb"localhost",  # Local development
+        rb"127\.0\.0\.1",  # Local IP
+        rb"framecast:.*:.*",  # URN patterns
+        rb"usr_[a-zA-Z0-9]+",  # Test user IDs
+        rb"tm_[a-zA-Z0-9]+",  # Test team IDs
+        rb"00000000-0000-0000-0000-000000000001",  # Test UUID pattern
+        rb"test_.*",  # Test identifiers
+        rb"fake_.*",  # Fake identifiers
     ]
+]
+
+# Single-pass alternations: one scan per line rejects lines with no
+# suspicious value, and one scan per match decides whether it is allowed
+SUSPICIOUS_UNION = re.compile(
+    b"|".join(b"(?:" + pattern.pattern + b")" for pattern, _ in SUSPICIOUS_PATTERNS),
+    re.IGNORECASE,
+)
+ALLOWED_UNION = re.compile(
+    b"|".join(b"(?:" + pattern.pattern + b")" for pattern in ALLOWED_PATTERNS),
+    re.IGNORECASE,
+)
+
+
+def scan_file(file_path):
+    """Scan one file for hardcoded values."""
+    errors = []
 
-    for file_path in file_paths:
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            lines = content.split("\n")
-
-            for line_num, line in enumerate(lines, 1):
+    try:
+        # Patterns are ASCII; scan raw bytes and only decode findings
+        with open(file_path, "rb") as f:
+            # bytes.splitlines() keeps universal-newline line numbering
+            for line_num, line in enumerate(f.read().splitlines(), 1):
                 # Skip comments
-                if line.strip().startswith("#") or line.strip().startswith("//"):
+                if line.strip().startswith((b"#", b"//")):
                     continue
 
                 # Skip lines with allowlist pragma
-                if "pragma: allowlist secret" in line:
+                if b"pragma: allowlist secret" in line:
                     continue
 
-                for pattern, description in suspicious_patterns:
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
+                # Every suspicious pattern needs one of these substrings;
+                # rejecting on them is far cheaper than running the regex
+                if not (
+                    b"-" in line
+                    or b"_" in line
+                    or b"://" in line
+                    or b"akia" in line.lower()
+                ):
+                    continue
+
+                # Most remaining lines match nothing; skip the per-pattern scans
+                if not SUSPICIOUS_UNION.search(line):
+                    continue
+
+                for pattern, description in SUSPICIOUS_PATTERNS:
+                    for match in pattern.finditer(line):
                         matched_text = match.group()
 
                         # Check if it's an allowed pattern
-                        is_allowed = any(
-                            re.search(allowed_pattern, matched_text, re.IGNORECASE)
-                            for allowed_pattern in allowed_patterns
-                        )
-
-                        if not is_allowed:
+                        if not ALLOWED_UNION.search(matched_text):
                             errors.append(f"{file_path}:{line_num}: {description}")
-                            errors.append(f"  Found: {matched_text}")
+                            found = matched_text.decode("utf-8", "replace")
+                            errors.append(f"  Found: {found}")
                             errors.append(
                                 "  Consider using environment variables instead"
                             )
 
-        except Exception as e:
-            errors.append(f"Error reading {file_path}: {e}")
+    except Exception as e:
+        errors.append(f"Error reading {file_path}: {e}")
 
     return errors
 
 
+def validate_env_vars(file_paths):
+    """Validate environment variable usage."""
+    return scan_files(scan_file, file_paths)
+
+
 def main():
     """Run environment variable validation as main entry point."""
     if len(sys.argv) < 2:
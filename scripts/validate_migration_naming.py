@@ -8,18 +8,18 @@ import os
 import re
 import sys
 
+# Expected pattern: YYYYMMDDHHMMSS_description.(up|down).sql
+MIGRATION_NAME_PATTERN = re.compile(r"^\d{14}_[a-z0-9_]+\.(up|down)\.sql$")
+
 
 def validate_migration_naming(file_paths):
     """Validate migration file naming convention."""
     errors = []
 
-    # Expected pattern: YYYYMMDDHHMMSS_description.(up|down).sql
-    pattern = r"^\d{14}_[a-z0-9_]+\.(up|down)\.sql$"
-
     for file_path in file_paths:
         filename = os.path.basename(file_path)
 
-        if not re.match(pattern, filename):
+        if not MIGRATION_NAME_PATTERN.match(filename):
             errors.append(f"Invalid migration filename: {filename}")
             errors.append("  Expected format: YYYYMMDDHHMMSS_description.(up|down).sql")
             errors.append("  Example: 20240130120000_add_user_table.up.sql")
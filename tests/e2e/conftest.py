@@ -6,18 +6,23 @@ end-to-end testing of the Framecast API against a running local stack.
 """
 
 import asyncio
+import base64
+import hashlib
+import hmac
+import json
 import os
 import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Mapping
+from datetime import UTC, datetime
+from types import MappingProxyType
 from typing import Any
 
 import asyncpg
 import httpx
-import jwt
 import pytest
 from faker import Faker
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from pydantic_settings import BaseSettings
 from utils.localstack_email import LocalStackEmailClient
 
@@ -52,6 +57,31 @@ class E2EConfig(BaseSettings):
     model_config = ConfigDict(env_prefix="TEST_", env_file=".env.test")
 
 
+# Signing key for test JWTs; it doesn't change during a session
+_JWT_SECRET = os.environ.get("JWT_SECRET", "test-e2e-secret-key-for-ci-only-0").encode()
+
+# Test tokens always use the same header, so its encoded segment is constant
+_JWT_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(
+    b"="
+)
+
+
+def _encode_hs256(payload: dict[str, Any], secret: bytes = _JWT_SECRET) -> str:
+    """Encode an HS256 JWT without going through PyJWT's algorithm registry."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    signing_input = (
+        _JWT_HEADER_SEGMENT + b"." + base64.urlsafe_b64encode(body).rstrip(b"=")
+    )
+    signature = hmac.new(secret, signing_input, hashlib.sha256).digest()
+    return (
+        signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")
+    ).decode()
+
+
+# Cached JWTs are re-signed once they are this close to expiring (seconds)
+TOKEN_REFRESH_MARGIN = 60
+
+
 # User personas for testing
 class UserPersona(BaseModel):
     """Represents a test user with specific characteristics."""
@@ -65,22 +95,47 @@ class UserPersona(BaseModel):
     owned_teams: list[str] = []
     api_keys: list[str] = []
 
+    # Signed token reused until close to expiry, keyed by the claims it carries
+    _cached_token: str | None = PrivateAttr(default=None)
+    _cached_exp: int = PrivateAttr(default=0)
+    _cached_claims: tuple[str, str] | None = PrivateAttr(default=None)
+    _cached_headers: Mapping[str, str] | None = PrivateAttr(default=None)
+
     def to_auth_token(self) -> str:
         """Generate a proper HS256 JWT token for this user."""
+        now = int(time.time())
+        claims = (self.user_id, self.email)
+        if (
+            self._cached_token is not None
+            and self._cached_claims == claims
+            and self._cached_exp - now > TOKEN_REFRESH_MARGIN
+        ):
+            return self._cached_token
+
         payload = {
             "sub": self.user_id,
             "email": self.email,
             "aud": "authenticated",
             "role": "authenticated",
-            "iat": int(time.time()),
-            "exp": int(time.time()) + 3600,
+            "iat": now,
+            "exp": now + 3600,
         }
-        secret = os.environ.get("JWT_SECRET", "test-e2e-secret-key-for-ci-only-0")
-        return jwt.encode(payload, secret, algorithm="HS256")
+        self._cached_token = _encode_hs256(payload)
+        self._cached_exp = payload["exp"]
+        self._cached_claims = claims
+        self._cached_headers = None
+        return self._cached_token
 
-    def auth_headers(self) -> dict[str, str]:
+    def auth_headers(self) -> Mapping[str, str]:
         """Return authorization headers for HTTP requests."""
-        return {"Authorization": f"Bearer {self.to_auth_token()}"}
+        token = self.to_auth_token()
+        if self._cached_headers is None:
+            self._cached_headers = MappingProxyType(
+                {"Authorization": f"Bearer {token}"}
+            )
+        # Read-only, so the same mapping can be handed to every request;
+        # callers that need extra headers spread it into a new dict
+        return self._cached_headers
 
 
 # Configuration and test environment
@@ -91,11 +146,13 @@ def test_config() -> E2EConfig:
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run the session event loop on uvloop when it is available."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
 
 
 # Database seeding for E2E tests
@@ -107,112 +164,162 @@ class SeededUsers:
         self.invitee = invitee
 
 
-@pytest.fixture
-async def seed_users(test_config: E2EConfig):
-    """Seed test users directly into the database for E2E tests."""
+# Seeded personas are inserted once per session; tests reset them in place
+SEED_OWNER_EMAIL = "owner-e2e@test.com"
+SEED_INVITEE_EMAIL = "invitee-e2e@test.com"
+
+# Seed rows only need a valid timestamp, not the moment of insertion
+_SEED_TIME = datetime.now(UTC)
+
+# Tables tests write to, cleared after every test that uses the seeded users
+EPHEMERAL_TABLES = (
+    "generations",
+    "generation_events",
+    "message_artifacts",
+    "messages",
+    "artifacts",
+    "conversations",
+    "api_keys",
+    "invitations",
+    "memberships",
+    "teams",
+)
+
+# Built once rather than per test. CASCADE stays: projects, webhooks and
+# asset_files reference these tables without being cleared themselves
+EPHEMERAL_TRUNCATE_SQL = f"TRUNCATE {', '.join(EPHEMERAL_TABLES)} CASCADE"
+SESSION_TRUNCATE_SQL = f"TRUNCATE {', '.join(EPHEMERAL_TABLES)}, users CASCADE"
+
+
+@pytest.fixture(scope="session")
+async def db_pool(test_config: E2EConfig) -> AsyncGenerator[asyncpg.Pool, None]:
+    """Connection pool shared by the database fixtures for the session."""
     database_url = os.environ.get("DATABASE_URL", test_config.database_url)
-    conn = await asyncpg.connect(database_url)
+    pool = await asyncpg.create_pool(
+        database_url,
+        min_size=2,
+        max_size=5,
+        max_inactive_connection_lifetime=300,
+        command_timeout=30,
+    )
     try:
-        owner_id = uuid.uuid4()
-        owner_email = "owner-e2e@test.com"
-        invitee_id = uuid.uuid4()
-        invitee_email = "invitee-e2e@test.com"
+        yield pool
+    finally:
+        await pool.close()
 
-        from datetime import UTC, datetime
 
-        now_dt = datetime.now(UTC)
+async def _upsert_seeded_users(
+    conn: asyncpg.Connection, owner_id: uuid.UUID, invitee_id: uuid.UUID
+) -> dict[str, uuid.UUID]:
+    """Insert the seeded owner and invitee, or restore them to their initial state.
 
-        # Upsert owner (Creator tier)
-        await conn.execute(
-            """
-            INSERT INTO users (id, email, name, tier, credits,
-                               ephemeral_storage_bytes, upgraded_at, created_at, updated_at)
-            VALUES ($1, $2, $3, 'creator', 5000, 0, $4, $4, $4)
-            ON CONFLICT (email) DO UPDATE SET
-                tier = 'creator', credits = 5000, upgraded_at = $4, updated_at = $4
-            """,
-            owner_id,
-            owner_email,
-            "Test Owner",
-            now_dt,
-        )
-        # Re-read the actual ID in case it was an existing row
-        row = await conn.fetchrow("SELECT id FROM users WHERE email = $1", owner_email)
-        owner_id = row["id"]
+    Returns the IDs by email; they differ from the ones passed in when the rows
+    already existed.
+    """
+    # Owner is Creator tier; invitee is Starter tier (auto-upgraded on accept)
+    rows = await conn.fetch(
+        """
+        INSERT INTO users (id, email, name, tier, credits,
+                           ephemeral_storage_bytes, upgraded_at, created_at, updated_at)
+        VALUES ($1, $2, $3, 'creator', 5000, 0, $7, $7, $7),
+               ($4, $5, $6, 'starter', 1000, 0, NULL, $7, $7)
+        ON CONFLICT (email) DO UPDATE SET
+            name = EXCLUDED.name,
+            tier = EXCLUDED.tier,
+            credits = EXCLUDED.credits,
+            ephemeral_storage_bytes = 0,
+            avatar_url = NULL,
+            upgraded_at = EXCLUDED.upgraded_at,
+            updated_at = EXCLUDED.updated_at
+        RETURNING id, email
+        """,
+        owner_id,
+        SEED_OWNER_EMAIL,
+        "Test Owner",
+        invitee_id,
+        SEED_INVITEE_EMAIL,
+        "Test Invitee",
+        _SEED_TIME,
+    )
+    return {row["email"]: row["id"] for row in rows}
 
-        # Upsert invitee (Starter tier — will be auto-upgraded on accept)
-        await conn.execute(
-            """
-            INSERT INTO users (id, email, name, tier, credits,
-                               ephemeral_storage_bytes, created_at, updated_at)
-            VALUES ($1, $2, $3, 'starter', 1000, 0, $4, $4)
-            ON CONFLICT (email) DO UPDATE SET
-                tier = 'starter', credits = 1000, upgraded_at = NULL, updated_at = $4
-            """,
-            invitee_id,
-            invitee_email,
-            "Test Invitee",
-            now_dt,
-        )
-        row = await conn.fetchrow(
-            "SELECT id FROM users WHERE email = $1", invitee_email
-        )
-        invitee_id = row["id"]
-
-        owner = UserPersona(
-            user_id=str(owner_id),
-            email=owner_email,
-            name="Test Owner",
-            tier="creator",
-            credits=5000,
-        )
-        invitee = UserPersona(
-            user_id=str(invitee_id),
-            email=invitee_email,
-            name="Test Invitee",
-            tier="starter",
-            credits=1000,
-        )
 
-        yield SeededUsers(owner=owner, invitee=invitee)
+@pytest.fixture(scope="session")
+async def seeded_users_session(db_pool: asyncpg.Pool):
+    """Insert the seeded users once for the whole session."""
+    owner_email = SEED_OWNER_EMAIL
+    invitee_email = SEED_INVITEE_EMAIL
+
+    # RETURNING yields the actual IDs in case the rows already existed
+    async with db_pool.acquire() as conn:
+        ids = await _upsert_seeded_users(conn, uuid.uuid4(), uuid.uuid4())
+    owner_id = ids[owner_email]
+    invitee_id = ids[invitee_email]
+
+    owner = UserPersona(
+        user_id=str(owner_id),
+        email=owner_email,
+        name="Test Owner",
+        tier="creator",
+        credits=5000,
+    )
+    invitee = UserPersona(
+        user_id=str(invitee_id),
+        email=invitee_email,
+        name="Test Invitee",
+        tier="starter",
+        credits=1000,
+    )
+
+    yield SeededUsers(owner=owner, invitee=invitee)
+
+    # TRUNCATE bypasses FK constraints and INV-T2 trigger
+    await db_pool.execute(SESSION_TRUNCATE_SQL)
 
-        # Cleanup: TRUNCATE bypasses FK constraints and INV-T2 trigger
+
+@pytest.fixture
+async def seed_users(db_pool: asyncpg.Pool, seeded_users_session: SeededUsers):
+    """Seeded test users, with everything tests created removed afterwards."""
+    yield seeded_users_session
+
+    # Cleanup: drop test-created rows and JIT-provisioned users, then restore
+    # the seeded users under their session IDs, re-inserting any a test deleted
+    owner_id = uuid.UUID(seeded_users_session.owner.user_id)
+    invitee_id = uuid.UUID(seeded_users_session.invitee.user_id)
+    async with db_pool.acquire() as conn, conn.transaction():
+        await conn.execute(EPHEMERAL_TRUNCATE_SQL)
         await conn.execute(
-            "TRUNCATE generations, generation_events, message_artifacts, messages, artifacts, conversations, "
-            "api_keys, invitations, memberships, teams, users CASCADE"
+            "DELETE FROM users WHERE id <> ALL($1::uuid[])", [owner_id, invitee_id]
         )
-    finally:
-        await conn.close()
+        await _upsert_seeded_users(conn, owner_id, invitee_id)
 
 
 # System asset seeding for E2E tests
-@pytest.fixture
-async def seed_system_assets(test_config: E2EConfig):
-    """Seed system assets into the database for E2E tests."""
-    database_url = os.environ.get("DATABASE_URL", test_config.database_url)
-    conn = await asyncpg.connect(database_url)
-    try:
-        assets = [
-            ("asset_sfx_whoosh_01", "sfx", "Whoosh 01", "audio/mpeg", 2048),
-            ("asset_ambient_rain_01", "ambient", "Rain 01", "audio/mpeg", 4096),
-            ("asset_music_chill_01", "music", "Chill 01", "audio/mpeg", 8192),
+@pytest.fixture(scope="session")
+async def seed_system_assets(db_pool: asyncpg.Pool):
+    """Seed system assets into the database once for the E2E session."""
+    assets = [
+        ("asset_sfx_whoosh_01", "sfx", "Whoosh 01", "audio/mpeg", 2048),
+        ("asset_ambient_rain_01", "ambient", "Rain 01", "audio/mpeg", 4096),
+        ("asset_music_chill_01", "music", "Chill 01", "audio/mpeg", 8192),
+        (
+            "asset_transition_fade_01",
+            "transition",
+            "Fade 01",
+            "video/mp4",
+            16384,
+        ),
+    ]
+    await db_pool.executemany(
+        """
+        INSERT INTO system_assets
+            (id, category, name, description, s3_key, content_type,
+             size_bytes, tags, created_at)
+        VALUES ($1, $2::system_asset_category, $3, $4, $5, $6, $7, $8, NOW())
+        ON CONFLICT (id) DO NOTHING
+        """,
+        [
             (
-                "asset_transition_fade_01",
-                "transition",
-                "Fade 01",
-                "video/mp4",
-                16384,
-            ),
-        ]
-        for asset_id, category, name, content_type, size_bytes in assets:
-            await conn.execute(
-                """
-                INSERT INTO system_assets
-                    (id, category, name, description, s3_key, content_type,
-                     size_bytes, tags, created_at)
-                VALUES ($1, $2::system_asset_category, $3, $4, $5, $6, $7, $8, NOW())
-                ON CONFLICT (id) DO NOTHING
-                """,
                 asset_id,
                 category,
                 name,
@@ -222,32 +329,40 @@ async def seed_system_assets(test_config: E2EConfig):
                 size_bytes,
                 ["test"],
             )
-        yield assets
-        await conn.execute("TRUNCATE system_assets CASCADE")
-    finally:
-        await conn.close()
+            for asset_id, category, name, content_type, size_bytes in assets
+        ],
+    )
+    yield assets
+    # Nothing references system_assets, so there is no dependency walk to do
+    await db_pool.execute("TRUNCATE system_assets")
 
 
 # HTTP client for API testing
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def http_client(
     test_config: E2EConfig,
 ) -> AsyncGenerator[httpx.AsyncClient, None]:
-    """HTTP client for making API requests."""
+    """HTTP client for making API requests, kept alive for the session."""
+    # One client for the session so tests reuse keep-alive connections
+    # instead of reconnecting to the API for every test
+    limits = httpx.Limits(
+        max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+    )
     async with httpx.AsyncClient(
         base_url=test_config.api_base_url,
         timeout=30.0,
+        limits=limits,
         headers={"User-Agent": "Framecast-E2E-Tests/0.0.1-SNAPSHOT"},
     ) as client:
         yield client
 
 
 # LocalStack email client for E2E testing
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def localstack_email_client(
     test_config: E2EConfig,
 ) -> AsyncGenerator[LocalStackEmailClient, None]:
-    """LocalStack SES email client for E2E tests."""
+    """LocalStack SES email client, kept alive for the session."""
     client = LocalStackEmailClient(test_config.localstack_ses_url)
     try:
         yield client
@@ -255,6 +370,10 @@ async def localstack_email_client(
         await client.close()
 
 
+# Faker loads its providers on construction, so build it once per module
+_FAKE = Faker()
+
+
 # Test data factories
 class TestDataFactory:
     """Factory for generating test data."""
@@ -262,11 +381,10 @@ class TestDataFactory:
     @staticmethod
     def team_data() -> dict[str, Any]:
         """Generate valid team creation data."""
-        fake = Faker()
         return {
-            "name": fake.company(),
-            "description": fake.text(max_nb_chars=200),
-            "settings": {"default_resolution": "1920x1080", "webhook_url": fake.url()},
+            "name": _FAKE.company(),
+            "description": _FAKE.text(max_nb_chars=200),
+            "settings": {"default_resolution": "1920x1080", "webhook_url": _FAKE.url()},
         }
 
     @staticmethod
@@ -347,7 +465,7 @@ def assert_credits_non_negative(credits: int) -> None:
 # Helper functions for multi-step E2E flows
 async def create_conversation(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     model: str = "test-model",
     title: str | None = None,
     system_prompt: str | None = None,
@@ -363,7 +481,7 @@ async def create_conversation(
 
 async def send_message(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     conversation_id: str,
     content: str = "Hello",
 ) -> dict[str, Any]:
@@ -381,7 +499,7 @@ async def send_message(
 
 async def create_storyboard(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     spec: dict[str, Any] | None = None,
     owner: str | None = None,
     project_id: str | None = None,
@@ -397,7 +515,7 @@ async def create_storyboard(
 
 async def create_character(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     spec: dict[str, Any] | None = None,
     owner: str | None = None,
     project_id: str | None = None,
@@ -413,7 +531,7 @@ async def create_character(
 
 def generate_jit_credentials(
     email: str | None = None,
-) -> tuple[str, str, dict[str, str]]:
+) -> tuple[str, str, Mapping[str, str]]:
     """Generate auth credentials for a user that does NOT exist in the database.
 
     Returns (user_id, email, auth_headers) for use in JIT provisioning tests.
@@ -421,7 +539,8 @@ def generate_jit_credentials(
     """
     user_id = str(uuid.uuid4())
     user_email = email or f"jit-{user_id[:8]}@test.com"
-    persona = UserPersona(
+    # Values are generated here, so skip field validation
+    persona = UserPersona.model_construct(
         user_id=user_id,
         email=user_email,
         name="JIT User",
@@ -443,15 +562,14 @@ def generate_jit_credentials_no_email() -> tuple[str, dict[str, str]]:
         "iat": int(time.time()),
         "exp": int(time.time()) + 3600,
     }
-    secret = os.environ.get("JWT_SECRET", "test-e2e-secret-key-for-ci-only-0")
-    token = jwt.encode(payload, secret, algorithm="HS256")
+    token = _encode_hs256(payload)
     headers = {"Authorization": f"Bearer {token}"}
     return user_id, headers
 
 
 async def create_ephemeral_generation(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     spec: dict[str, Any] | None = None,
     options: dict[str, Any] | None = None,
     idempotency_key: str | None = None,
@@ -476,7 +594,7 @@ async def create_ephemeral_generation(
 
 async def create_generation_from_artifact(
     client: httpx.AsyncClient,
-    headers: dict[str, str],
+    headers: Mapping[str, str],
     artifact_id: str,
 ) -> dict[str, Any]:
     """Generate from an artifact and return the response JSON (generation + artifact)."""
@@ -587,6 +705,22 @@ async def reset_mock_render(client: httpx.AsyncClient) -> None:
     )
 
 
+async def reset_and_configure_mock_render(
+    client: httpx.AsyncClient,
+    outcome: str = "complete",
+    delay_ms: int = 50,
+    progress_steps: list[float] | None = None,
+) -> None:
+    """Reset mock render history and behavior, then configure it, in one request."""
+    payload: dict[str, Any] = {"outcome": outcome, "delay_ms": delay_ms}
+    if progress_steps is not None:
+        payload["progress_steps"] = progress_steps
+    resp = await client.post("/internal/mock/render/reset_and_configure", json=payload)
+    assert resp.status_code == 200, (
+        f"reset_and_configure_mock_render failed: {resp.status_code} {resp.text}"
+    )
+
+
 async def get_mock_render_history(client: httpx.AsyncClient) -> list[dict[str, Any]]:
     """Get mock render request history."""
     resp = await client.get("/internal/mock/render/history")
@@ -600,6 +734,7 @@ __all__ = [
     "UserPersona",
     "SeededUsers",
     "test_config",
+    "db_pool",
     "http_client",
     "localstack_email_client",
     "seed_users",
@@ -620,5 +755,6 @@ __all__ = [
     "fail_generation",
     "configure_mock_render",
     "reset_mock_render",
+    "reset_and_configure_mock_render",
     "get_mock_render_history",
 ]
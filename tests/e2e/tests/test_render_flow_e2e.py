@@ -1,11 +1,11 @@
 """Render Flow E2E Tests.
 
-Tests the render orchestration flow end-to-end (30 stories):
+Tests the render orchestration flow end-to-end (31 stories):
   - Render creation (RF-01 through RF-06)
   - Generation callbacks and state transitions (RF-07 through RF-15)
   - Artifact status updates (RF-16 through RF-20)
   - Error handling (RF-21 through RF-25)
-  - Mock render integration (RF-26 through RF-30)
+  - Mock render integration (RF-26 through RF-31)
 """
 
 import sys
@@ -25,6 +25,7 @@ from conftest import (  # noqa: E402
     create_storyboard,
     fail_generation,
     get_mock_render_history,
+    reset_and_configure_mock_render,
     reset_mock_render,
     trigger_callback,
 )
@@ -561,7 +562,7 @@ class TestRenderFlowE2E:
         assert resp.status_code in [200, 400]
 
     # -------------------------------------------------------------------
-    # Mock Render Integration (RF-26 through RF-30)
+    # Mock Render Integration (RF-26 through RF-31)
     # -------------------------------------------------------------------
 
     async def test_rf26_configure_mock_render(
@@ -592,8 +593,9 @@ class TestRenderFlowE2E:
     ):
         """RF-28: Mock render history records render requests."""
         owner = seed_users.owner
-        await reset_mock_render(http_client)
-        await configure_mock_render(http_client, outcome="complete", delay_ms=50)
+        await reset_and_configure_mock_render(
+            http_client, outcome="complete", delay_ms=50
+        )
 
         character = await create_character(http_client, owner.auth_headers())
         await create_generation_from_artifact(
@@ -610,8 +612,7 @@ class TestRenderFlowE2E:
     ):
         """RF-29: Configure mock render to fail and verify generation fails."""
         owner = seed_users.owner
-        await reset_mock_render(http_client)
-        await configure_mock_render(http_client, outcome="fail", delay_ms=50)
+        await reset_and_configure_mock_render(http_client, outcome="fail", delay_ms=50)
 
         character = await create_character(http_client, owner.auth_headers())
         result = await create_generation_from_artifact(
@@ -639,8 +640,7 @@ class TestRenderFlowE2E:
     ):
         """RF-30: Configure mock render with progress steps."""
         owner = seed_users.owner
-        await reset_mock_render(http_client)
-        await configure_mock_render(
+        await reset_and_configure_mock_render(
             http_client,
             outcome="complete",
             delay_ms=50,
@@ -655,3 +655,56 @@ class TestRenderFlowE2E:
         # Verify generation was created successfully
         assert result["generation"]["status"] == "queued"
         assert result["artifact"]["status"] == "pending"
+
+    async def test_rf31_reset_and_configure_mock_render(
+        self,
+        http_client: httpx.AsyncClient,
+        seed_users: SeededUsers,
+    ):
+        """RF-31: Reset-and-configure clears history in the same request."""
+        owner = seed_users.owner
+        await configure_mock_render(http_client, outcome="complete", delay_ms=50)
+
+        character = await create_character(http_client, owner.auth_headers())
+        await create_generation_from_artifact(
+            http_client, owner.auth_headers(), character["id"]
+        )
+        assert len(await get_mock_render_history(http_client)) >= 1
+
+        try:
+            await reset_and_configure_mock_render(
+                http_client, outcome="fail", delay_ms=50
+            )
+
+            history = await get_mock_render_history(http_client)
+            assert len(history) == 0
+
+            # The new configuration applies to the next render
+            result = await create_generation_from_artifact(
+                http_client, owner.auth_headers(), character["id"]
+            )
+            generation_id = result["generation"]["id"]
+
+            # Poll until the mock's callbacks reach a terminal status
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 10.0
+            while True:
+                resp = await http_client.get(
+                    f"/v1/generations/{generation_id}", headers=owner.auth_headers()
+                )
+                assert resp.status_code == 200
+                status = resp.json()["status"]
+                if (
+                    status in ["completed", "failed", "canceled"]
+                    or loop.time() >= deadline
+                ):
+                    break
+                await asyncio.sleep(0.1)
+
+            assert status == "failed"
+            assert len(await get_mock_render_history(http_client)) == 1
+        finally:
+            # Leave the mock completing renders for later test files
+            await reset_and_configure_mock_render(http_client, outcome="complete")
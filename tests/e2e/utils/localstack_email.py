@@ -64,7 +64,11 @@ class LocalStackEmailClient:
             base_url: LocalStack base URL (default: http://localhost:4566)
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Keep a few connections alive so a session-long client reuses them
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
 
     async def close(self) -> None:
         """Close the HTTP client."""